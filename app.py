@@ -1,20 +1,57 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS, cross_origin
+from werkzeug.middleware.proxy_fix import ProxyFix
 from crawler import NamuWikiCrawler
+from response_cache import ResponseCache
+from rate_limit import TokenBucketLimiter, CrawlSlots
+import gc
+import hashlib
 import os
+import time
 
 app = Flask(__name__)
 
+# 앞단 프록시(Railway/Heroku 등)가 붙인 X-Forwarded-* 헤더만 신뢰 - 클라이언트가 보낸 값은 무시
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+if TRUSTED_PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS, x_proto=TRUSTED_PROXY_HOPS, x_host=TRUSTED_PROXY_HOPS)
+
 # CORS 설정 - Vercel 프론트엔드 허용
 CORS(app, 
      origins=["*"],
      methods=["GET", "POST", "OPTIONS"],
-     allow_headers=["Content-Type", "Authorization"],
-     expose_headers=["Content-Type"],
+     allow_headers=["Content-Type", "Authorization", "X-API-Key"],
+     expose_headers=["Content-Type", "ETag", "Retry-After"],
      supports_credentials=False,
      max_age=3600)
 
 crawler = NamuWikiCrawler()
+response_cache = ResponseCache()
+
+# 요청 제한 - 캐시된 결과는 싸게(기본 무료), 새 크롤링은 비싸게
+limiter = TokenBucketLimiter(os.path.join(crawler.cache_dir, 'ratelimit.sqlite3'))
+crawl_slots = CrawlSlots(os.path.join(crawler.cache_dir, 'locks'))
+CACHED_SEARCH_COST = float(os.environ.get('CACHED_SEARCH_COST', 0))
+COLD_SEARCH_COST = float(os.environ.get('COLD_SEARCH_COST', 10))
+COLD_CRAWL_WAIT_SECONDS = float(os.environ.get('COLD_CRAWL_WAIT_SECONDS', 5))
+API_KEYS = {key.strip() for key in os.environ.get('API_KEYS', '').split(',') if key.strip()}
+
+
+def image_base_url():
+    """프록시 이미지 URL 앞에 붙일 백엔드 주소 - PUBLIC_BASE_URL (이미지 프록시를 쓰지 않으면 None)"""
+    if not crawler.use_image_proxy:
+        return None
+    return crawler.image_cache.public_base_url
+
+def serialize(result, base_url):
+    """검색 결과 레코드를 응답 JSON 바이트로 직렬화 (이미지는 base_url 기준 프록시 주소로 변환)"""
+    if base_url is None:
+        return result.to_json()
+    return result.to_json(lambda url: crawler.image_cache.proxy_url(url, base_url))
+
+def json_response(result, status=200):
+    """검색 결과 레코드를 JSON 응답으로 변환 (orjson 사용 가능 시 사용)"""
+    return Response(serialize(result, image_base_url()), status=status, mimetype='application/json')
 
 @app.route('/')
 @cross_origin()
@@ -25,10 +62,136 @@ def index():
         'message': 'Nuna Backend API',
         'version': '1.0.0',
         'endpoints': {
-            'POST /search': '학교 출신 유명인 검색'
+            'POST /search': '학교 출신 유명인 검색',
+            'GET /search?school=': '학교 출신 유명인 검색 (캐시 가능)',
+            'GET /img/<hash>': '프로필 이미지 프록시'
         }
     })
 
+def request_budget(params):
+    """요청 파라미터(max_people, max_seconds, max_bytes)로 크롤링 예산 결정"""
+    def number(key, cast):
+        try:
+            value = cast(params.get(key))
+            return value if value > 0 else None
+        except (TypeError, ValueError):
+            return None
+    
+    return crawler.budget.limited(
+        max_people=number('max_people', int),
+        max_seconds=number('max_seconds', float),
+        max_bytes=number('max_bytes', int)
+    )
+
+def client_id():
+    """요청 제한 단위 - 등록된 API 키가 있으면 키, 없으면 클라이언트 IP (TRUSTED_PROXY_HOPS만큼의 프록시 뒤 주소)
+
+    키는 로그와 요청 제한 저장소에 남으므로 원문 대신 해시 앞부분을 사용한다.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if api_key and api_key in API_KEYS:
+        return f"key:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]}"
+    return f"ip:{request.remote_addr}"
+
+def too_many_requests(retry_after):
+    response = jsonify({'error': f'요청이 너무 많습니다. {retry_after}초 후 다시 시도해주세요.'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def admitted_search_response(school_name, params):
+    """요청 제한과 동시 크롤링 수 제한을 거쳐 검색 결과 반환"""
+    refresh = is_refresh(params)
+    mtime = crawler.cache_mtime(school_name)
+    cold = refresh or mtime is None or crawler.cache_expired(mtime)
+    
+    client = client_id()
+    cost = COLD_SEARCH_COST if cold else CACHED_SEARCH_COST
+    if cost > 0:
+        allowed, retry_after = limiter.take(client, cost)
+        if not allowed:
+            print(f"[요청 제한] {client} 학교명: {school_name}")
+            return too_many_requests(retry_after)
+    
+    if not cold:
+        return cached_search_response(school_name, request_budget(params), refresh)
+    
+    # 새 크롤링은 전체 워커를 통틀어 MAX_COLD_CRAWLS개까지만 동시에 실행 (잠시 대기 후 429)
+    slot = crawl_slots.acquire(COLD_CRAWL_WAIT_SECONDS)
+    if slot is None:
+        print(f"[크롤링 대기열 가득 참] 학교명: {school_name}")
+        if cost > 0:
+            limiter.refund(client, cost)  # 크롤링하지 못했으므로 토큰은 되돌림
+        return too_many_requests(10)
+    try:
+        return cached_search_response(school_name, request_budget(params), refresh)
+    finally:
+        crawl_slots.release(slot)
+
+def is_refresh(params):
+    """증분 갱신 요청 여부 (refresh=1 / true)"""
+    return str(params.get('refresh', '')).lower() in ('1', 'true', 'yes')
+
+def cached_search_response(school_name, budget=None, refresh=False):
+    """검색 결과를 ETag/Cache-Control/압축과 함께 반환 (직렬화·압축 결과는 메모리에 보관)"""
+    base_url = image_base_url()
+    cache_key = crawler.get_cache_path(school_name)
+    mtime = crawler.cache_mtime(school_name)
+    fresh = mtime and not refresh and not crawler.cache_expired(mtime)
+    entry = response_cache.get(cache_key, mtime) if fresh else None
+    
+    if entry is None:
+        print(f"[검색 요청] 학교명: {school_name}{' (증분 갱신)' if refresh else ''}")
+        result = crawler.crawl_school_celebrities(school_name, budget, refresh)
+        if result.error:
+            print(f"[오류] {result.error}")
+            response = json_response(result)  # 404 대신 200으로 반환하되 error 필드 포함
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+        
+        print(f"[검색 성공] 연예인 {result.count}명 발견")
+        if not result.complete:
+            # 부분 결과는 다음 요청에서 이어서 크롤링하므로 캐시하지 않음
+            response = json_response(result)
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+        mtime = crawler.cache_mtime(school_name)
+        if not mtime:
+            return json_response(result)
+        entry = response_cache.put(cache_key, mtime, serialize(result, base_url))
+    
+    body, encoding = entry.encoded(request.accept_encodings)
+    max_age = max(0, int(mtime + crawler.cache_ttl - time.time()))
+    headers = {
+        'ETag': f'"{entry.etag_for(encoding)}"',
+        'Cache-Control': f'public, max-age={max_age}',
+        'Vary': 'Accept-Encoding'
+    }
+    # 다른 인코딩으로 받은 ETag나, CDN이 압축하면서 W/"..."로 바꾼 약한 ETag도 일치로 봄
+    if any(request.if_none_match.contains_weak(etag) for etag in entry.etags()):
+        return Response(status=304, headers=headers)
+    
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, status=200, headers=headers, mimetype='application/json')
+
+@app.route('/search', methods=['GET'])
+@cross_origin()
+def search_get():
+    """학교 검색 API (GET, CDN/브라우저 캐시 가능)"""
+    school_name = request.args.get('school', '').strip()
+    
+    if not school_name:
+        return jsonify({'error': '학교 이름을 입력해주세요.'}), 400
+    
+    try:
+        return admitted_search_response(school_name, request.args)
+    except Exception as e:
+        import traceback
+        print(f"[예외 발생] {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'검색 중 오류가 발생했습니다: {str(e)}'}), 500
+
 @app.route('/search', methods=['POST', 'OPTIONS'])
 @cross_origin()
 def search():
@@ -43,21 +206,49 @@ def search():
         return jsonify({'error': '학교 이름을 입력해주세요.'}), 400
     
     try:
-        print(f"[검색 요청] 학교명: {school_name}")
-        result = crawler.crawl_school_celebrities(school_name)
-        
-        if 'error' in result:
-            print(f"[오류] {result.get('error')}")
-            return jsonify(result), 200  # 404 대신 200으로 반환하되 error 필드 포함
-        
-        print(f"[검색 성공] 연예인 {result.get('count', 0)}명 발견")
-        return jsonify(result), 200
+        return admitted_search_response(school_name, data)
     except Exception as e:
         import traceback
         print(f"[예외 발생] {str(e)}")
         traceback.print_exc()
         return jsonify({'error': f'검색 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@app.route('/img/<key>')
+@cross_origin()
+def image(key):
+    """이미지 프록시 - 나무위키 이미지를 한 번만 받아 캐시해서 제공 (?w=100|200|400 썸네일)"""
+    entry = crawler.image_cache.get(key, request.args.get('w', type=int))
+    if entry is None:
+        return jsonify({'error': '이미지를 찾을 수 없습니다.'}), 404
+    
+    path, content_type, etag = entry
+    response = send_file(path, mimetype=content_type, etag=etag, max_age=31536000, conditional=True)
+    response.cache_control.immutable = True
+    return response
+
+def warm_up():
+    """gunicorn --preload용 - 마스터에서 파싱 스택과 메모리 응답 캐시를 미리 준비
+
+    fork된 워커는 이 상태를 copy-on-write로 공유하므로 워커마다 다시 만들지 않는다.
+    """
+    started = time.perf_counter()
+    crawler.warm_up()
+    
+    # 최근에 저장된 캐시 파일부터 메모리 응답 캐시에 올림
+    base_url = image_base_url()
+    entries = [e for e in os.scandir(crawler.cache_dir) if e.name.endswith('.json')]
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    loaded = 0
+    for entry in entries[:response_cache.max_entries]:
+        result = crawler.load_cache_file(entry.path)
+        if result and not result.error and result.complete:
+            response_cache.put(entry.path, entry.stat().st_mtime, serialize(result, base_url))
+            loaded += 1
+    
+    # 준비한 객체를 GC 대상에서 빼서 워커에서 페이지가 복사되지 않도록 함
+    gc.freeze()
+    print(f"[워밍업 완료] 캐시 {loaded}개, {time.perf_counter() - started:.2f}초")
+
 if __name__ == '__main__':
     # cache 디렉토리 확인
     if not os.path.exists('cache'):
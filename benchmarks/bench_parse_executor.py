@@ -0,0 +1,101 @@
+"""파싱 실행기 벤치마크 - 워커 수에 따른 인물 문서 처리량 측정
+
+사용법:
+    # 1. 실제 나무위키 페이지를 fixture로 기록
+    python benchmarks/bench_parse_executor.py --record 서울예술고등학교 --limit 40
+
+    # 2. 기록된 fixture로 처리량 측정
+    python benchmarks/bench_parse_executor.py --repeat 5
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parse_executor import InlineParseExecutor, ProcessParseExecutor, analyze_person_page
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def record(school_name, limit):
+    """학교 문서와 출신 인물 문서를 fixture 디렉토리에 저장"""
+    import requests
+    from crawler import NamuWikiCrawler
+
+    crawler = NamuWikiCrawler(parse_executor=InlineParseExecutor())
+    html = crawler.get_school_page(school_name)
+    if not html:
+        print(f"학교 문서를 찾을 수 없음: {school_name}")
+        return
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    alumni = crawler.extract_alumni_section(html.decode('utf-8', errors='replace'))
+    for person in alumni[:limit]:
+        time.sleep(1)
+        try:
+            response = requests.get(f"{crawler.base_url}{person.url}", headers=crawler.headers, timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"요청 실패 {person.name}: {e}")
+            continue
+        path = os.path.join(FIXTURE_DIR, f"{urllib.parse.quote(person.name, safe='')}.html")
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        print(f"기록: {person.name}")
+
+
+def load_fixtures():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+        name = urllib.parse.unquote(os.path.basename(path)[:-len('.html')])
+        with open(path, 'rb') as f:
+            pages.append((name, f"/w/{urllib.parse.quote(name)}", f.read()))
+    return pages
+
+
+def run(executor, pages, repeat):
+    start = time.perf_counter()
+    futures = [executor.submit(analyze_person_page, *page) for _ in range(repeat) for page in pages]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--record', metavar='SCHOOL')
+    parser.add_argument('--limit', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.limit)
+        return
+
+    pages = load_fixtures()
+    if not pages:
+        print(f"fixture가 없습니다. 먼저 --record 로 {FIXTURE_DIR} 에 페이지를 기록하세요.")
+        return
+
+    total = len(pages) * args.repeat
+    elapsed = run(InlineParseExecutor(), pages, args.repeat)
+    print(f"inline      : {total / elapsed:8.1f} pages/s ({elapsed:.2f}s)")
+
+    cpu = os.cpu_count() or 1
+    workers = 1
+    while True:
+        executor = ProcessParseExecutor(max_workers=workers)
+        executor.submit(analyze_person_page, *pages[0]).result()  # 워커 기동 비용 제외
+        elapsed = run(executor, pages, args.repeat)
+        executor.shutdown()
+        print(f"process x{workers:<3}: {total / elapsed:8.1f} pages/s ({elapsed:.2f}s)")
+        if workers >= cpu:
+            break
+        workers = min(workers * 2, cpu)
+
+
+if __name__ == '__main__':
+    main()
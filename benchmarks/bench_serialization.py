@@ -0,0 +1,58 @@
+"""검색 결과 직렬화 벤치마크 - 100명 규모 결과의 응답 직렬화 시간과 캐시 파일 크기 비교
+
+사용법:
+    python benchmarks/bench_serialization.py --people 100 --iterations 2000
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import records
+from records import Celebrity, SchoolResult
+
+
+def make_result(people):
+    jobs = ['배우', '가수', '아이돌', '방송인', '모델']
+    celebrities = [
+        Celebrity(
+            f"홍길동{i}",
+            jobs[i % len(jobs)],
+            '에스엠엔터테인먼트' if i % 3 == 0 else None,
+            f"https://i.namu.wiki/i/{'a' * 40}{i:04d}.webp",
+            f"https://namu.wiki/w/%ED%99%8D%EA%B8%B8%EB%8F%99{i}"
+        )
+        for i in range(people)
+    ]
+    return SchoolResult('서울예술고등학교', celebrities)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--people', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    result = make_result(args.people)
+    data = result.to_dict()
+
+    # 기존 방식: Flask jsonify (json.dumps) / 캐시 json.dump(indent=2)
+    legacy_response = lambda: json.dumps(data, ensure_ascii=False).encode('utf-8')
+    legacy_cache = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    n = args.iterations
+    legacy = timeit.timeit(legacy_response, number=n) / n
+    current = timeit.timeit(result.to_json, number=n) / n
+
+    print(f"backend          : {'orjson' if records.orjson is not None else 'json'}")
+    print(f"response (json)  : {legacy * 1e6:8.1f} us/request")
+    print(f"response (record): {current * 1e6:8.1f} us/request")
+    print(f"cache (indent=2) : {len(legacy_cache):8d} bytes")
+    print(f"cache (compact)  : {len(result.to_json()):8d} bytes")
+
+
+if __name__ == '__main__':
+    main()
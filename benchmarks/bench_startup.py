@@ -0,0 +1,98 @@
+"""워커 기동 벤치마크 - 프로세스 시작부터 첫 응답까지 걸리는 시간 측정
+
+사용법:
+    # 새 프로세스에서 app 임포트 + 첫 요청 (무거운 모듈을 미리 불러오는 경우와 비교)
+    python benchmarks/bench_startup.py --runs 10
+
+    # 실제 gunicorn 기동 후 첫 응답까지 (--preload 설정 유무 비교)
+    python benchmarks/bench_startup.py --gunicorn --path "/search?school=서울예술고등학교"
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_REQUEST = """
+import time
+started = time.perf_counter()
+{prelude}
+import app
+app.app.test_client().get({path!r})
+print(time.perf_counter() - started)
+"""
+
+
+def run_import(prelude, path):
+    code = FIRST_REQUEST.format(prelude=prelude, path=path)
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT, stderr=subprocess.DEVNULL)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_gunicorn(config, path, workers):
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:app', '-c', config,
+         '--bind', f'127.0.0.1:{port}', '--workers', str(workers)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}{urllib.parse.quote(path, safe="/?=&")}'
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    response.read()
+                return time.perf_counter() - started
+            except OSError:
+                if proc.poll() is not None:
+                    raise RuntimeError('gunicorn이 종료되었습니다.')
+                time.sleep(0.01)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def report(label, samples):
+    print(f"{label:<30}: median {statistics.median(samples) * 1000:7.1f} ms, "
+          f"min {min(samples) * 1000:7.1f} ms ({len(samples)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--gunicorn', action='store_true')
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    if args.gunicorn:
+        empty_config = os.path.join(ROOT, 'benchmarks', '.empty_gunicorn.conf.py')
+        with open(empty_config, 'w') as f:
+            f.write('')
+        try:
+            report('gunicorn (no preload)', [run_gunicorn(empty_config, args.path, args.workers) for _ in range(args.runs)])
+            report('gunicorn (gunicorn.conf.py)', [run_gunicorn('gunicorn.conf.py', args.path, args.workers) for _ in range(args.runs)])
+        finally:
+            os.remove(empty_config)
+        return
+
+    eager = 'import requests, bs4, lxml.etree, concurrent.futures.process'
+    report('import + first request (eager)', [run_import(eager, args.path) for _ in range(args.runs)])
+    report('import + first request (lazy)', [run_import('', args.path) for _ in range(args.runs)])
+
+
+if __name__ == '__main__':
+    main()
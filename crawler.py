@@ -1,13 +1,37 @@
-import requests
-from bs4 import BeautifulSoup
+import fcntl
 import time
 import urllib.parse
 import re
-import json
 import os
+from collections import deque
+from parse_executor import make_parse_executor, analyze_school_page, analyze_person_page
+from image_cache import ImageCache
+from sources import make_source
+from records import Alumnus, PersonInfo, Celebrity, PersonStatus, CrawlBudget, SchoolResult, dumps, loads
+
+# 연예인 & 예술인 키워드
+CELEBRITY_KEYWORDS = [
+    # 방송/연예
+    '배우', '가수', '아이돌', '래퍼', '방송인', '개그맨', 
+    '코미디언', 'mc', '엠씨', '아나운서', '모델', '연예인',
+    '싱어', 'singer', 'actor', 'actress', 'idol', 'rapper',
+    '뮤지컬', 'musical', '탤런트', '예능',
+    # 음악 예술
+    '피아니스트', 'pianist', '바이올리니스트', 'violinist',
+    '첼리스트', 'cellist', '성악가', '지휘자', 'conductor',
+    '작곡가', 'composer', '연주자', '클래식',
+    # 무용 예술
+    '무용가', '발레리나', 'ballerina', '댄서', 'dancer',
+    '안무가', 'choreographer',
+    # 미술 예술
+    '화가', 'painter', '조각가', 'sculptor', '예술가', 'artist',
+    # 기타 예술
+    '성우', '뮤지션', 'musician'
+]
+
 
 class NamuWikiCrawler:
-    def __init__(self, cache_dir="cache"):
+    def __init__(self, cache_dir="cache", parse_executor=None, source=None):
         self.base_url = "https://namu.wiki"
         self.cache_dir = cache_dir
         self.headers = {
@@ -33,23 +57,71 @@ class NamuWikiCrawler:
         ]
         # 선택적 프록시 (환경 변수로 설정 가능)
         self.proxy_url = os.environ.get('PROXY_URL')
+        # 문서 소스 (NAMU_SOURCE=dump 이면 덤프로 만든 로컬 저장소, 기본은 나무위키 사이트)
+        self.source = source or make_source(self)
+        # HTML 파싱 실행기 (PARSE_EXECUTOR=process 이면 프로세스 풀)
+        self.parse_executor = parse_executor or make_parse_executor(self)
+        
+        # 캐시 유효 시간 (초) - 응답 Cache-Control에 사용
+        self.cache_ttl = int(os.environ.get('CACHE_TTL', 7 * 24 * 3600))
+        # 증분 갱신 시 인물 문서를 다시 확인하는 주기 (초)
+        self.person_ttl = int(os.environ.get('PERSON_TTL', 30 * 24 * 3600))
         
         # 캐시 디렉토리 생성
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
+        
+        # 요청당 크롤링 예산 (CRAWL_MAX_PEOPLE / CRAWL_MAX_SECONDS / CRAWL_MAX_BYTES)
+        self.budget = CrawlBudget.from_env()
+        
+        # 이미지 프록시 캐시 (IMAGE_PROXY=0 이거나 PUBLIC_BASE_URL이 없으면 나무위키 이미지 URL 그대로 사용)
+        # 결과에는 원본 URL을 저장하고 프록시 주소는 응답할 때 만든다 (PUBLIC_BASE_URL을 바꿔도 캐시가 그대로 유효)
+        # 요청의 Host 헤더는 클라이언트가 정하므로 프록시 주소에 쓰지 않는다
+        self.image_cache = ImageCache(
+            os.path.join(cache_dir, 'images'),
+            public_base_url=os.environ.get('PUBLIC_BASE_URL', '')
+        )
+        self.use_image_proxy = os.environ.get('IMAGE_PROXY', '1') != '0'
+        if self.use_image_proxy and not self.image_cache.public_base_url:
+            print("[이미지 프록시 꺼짐] PUBLIC_BASE_URL이 설정되지 않아 나무위키 이미지 URL을 그대로 사용합니다.")
+            self.use_image_proxy = False
+    
+    def warm_up(self):
+        """requests, bs4/lxml을 미리 불러오기 (gunicorn --preload 시 마스터에서 한 번 실행해 워커가 공유)
+
+        bs4/lxml과 requests는 무거우므로 사용하는 메서드 안에서 불러온다 (워커 기동 시간 단축).
+        """
+        import requests
+        from bs4 import BeautifulSoup
+        
+        BeautifulSoup('<p></p>', 'lxml')
     
     def get_cache_path(self, school_name):
         """캐시 파일 경로 반환"""
         safe_name = re.sub(r'[^\w\s-]', '', school_name).strip()
         return os.path.join(self.cache_dir, f"{safe_name}.json")
     
+    def cache_mtime(self, school_name):
+        """캐시 파일 수정 시각 반환 (없으면 None)"""
+        try:
+            return os.path.getmtime(self.get_cache_path(school_name))
+        except OSError:
+            return None
+    
+    def cache_expired(self, mtime):
+        """캐시 파일이 cache_ttl보다 오래되었는지 (만료된 캐시는 다음 요청에서 증분 갱신)"""
+        return mtime is not None and time.time() - mtime > self.cache_ttl
+    
     def load_cache(self, school_name):
         """캐시에서 데이터 로드"""
-        cache_path = self.get_cache_path(school_name)
+        return self.load_cache_file(self.get_cache_path(school_name))
+    
+    def load_cache_file(self, cache_path):
+        """캐시 파일 경로로 데이터 로드"""
         if os.path.exists(cache_path):
             try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(cache_path, 'rb') as f:
+                    return SchoolResult.from_dict(loads(f.read()))
             except:
                 return None
         return None
@@ -58,83 +130,117 @@ class NamuWikiCrawler:
         """데이터를 캐시에 저장"""
         cache_path = self.get_cache_path(school_name)
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(cache_path, 'wb') as f:
+                f.write(data.to_cache_json())
         except Exception as e:
             print(f"캐시 저장 실패: {e}")
     
-    def get_school_page(self, school_name):
-        """학교 문서 페이지 가져오기"""
-        # 여러 변형 시도
-        variations = [
-            school_name,  # 원본
-            school_name.replace(' ', ''),  # 띄어쓰기 제거
-            school_name.replace(' ', '·'),  # 나무위키 중간점
-        ]
-        
-        # "고등학교" ↔ "고" 변환 추가
-        if '고등학교' in school_name:
-            # "서울예술고등학교" → "서울예술고"
-            short_name = school_name.replace('고등학교', '고')
-            variations.append(short_name)
-            variations.append(short_name.replace(' ', ''))
-        elif school_name.endswith('고'):
-            # "서울예술고" → "서울예술고등학교"
-            full_name = school_name[:-1] + '고등학교'
-            variations.append(full_name)
-            variations.append(full_name.replace(' ', ''))
-        
-        # 세션 생성
-        session = requests.Session()
-        session.headers.update(self.headers)
-        if self.proxy_url:
-            session.proxies.update({'http': self.proxy_url, 'https': self.proxy_url})
-
-        # 각 variant에 대해 여러번 시도 (User-Agent 회전, 지수 백오프)
-        for i, variant in enumerate(variations):
-            encoded_name = urllib.parse.quote(variant)
-            url = f"{self.base_url}/w/{encoded_name}"
-
-            # variant 간 기본 대기
-            if i > 0:
-                time.sleep(0.5)  # 1.5초 → 0.5초로 단축
-
-            max_attempts = 2  # 3회 → 2회로 감소
-            for attempt in range(1, max_attempts + 1):
-                # 시도할 때마다 User-Agent를 바꿔 본다
-                ua = self.user_agents[(attempt - 1) % len(self.user_agents)]
-                session.headers.update({'User-Agent': ua, 'Referer': self.headers.get('Referer')})
-
-                try:
-                    print(f"[시도] URL: {url} (variant={variant}, attempt={attempt})")
-                    response = session.get(url, timeout=10, allow_redirects=True)
+    def get_checkpoint_path(self, school_name):
+        """크롤링 체크포인트 파일 경로 반환"""
+        safe_name = re.sub(r'[^\w\s-]', '', school_name).strip()
+        return os.path.join(self.cache_dir, f"{safe_name}.checkpoint.jsonl")
+    
+    def start_checkpoint(self, school_name, alumni_list, entries=()):
+        """체크포인트 시작 - 첫 줄에 확인할 출신 인물 목록(우선순위 순), 이어서 이미 확인된 기록(entries) 저장"""
+        path = self.get_checkpoint_path(school_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps({'alumni': [a.to_dict() for a in alumni_list]}) + b'\n')
+                for entry in entries:
+                    f.write(dumps(entry) + b'\n')
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"체크포인트 저장 실패: {e}")
+    
+    def record_progress(self, school_name, person, status, celebrity=None):
+        """인물 한 명의 확인 결과(status는 PersonStatus 참고)를 체크포인트에 추가 (워커가 죽어도 남도록 fsync)"""
+        line = {
+            'url': person.url,
+            'status': status,
+            'checked_at': time.time(),
+            'celebrity': celebrity.to_dict() if celebrity else None
+        }
+        try:
+            with open(self.get_checkpoint_path(school_name), 'ab') as f:
+                f.write(dumps(line) + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            print(f"체크포인트 기록 실패: {e}")
+    
+    def lock_school(self, school_name, wait_seconds=5):
+        """학교별 크롤링 잠금 (fcntl.flock) - 같은 학교는 한 번에 한 워커만 체크포인트를 쓰고 캐시로 옮김
 
-                    if response.status_code == 200:
-                        print(f"[성공] 학교 페이지 로드: {variant}")
-                        return response.text
-                    elif response.status_code == 404:
-                        print(f"[404] 페이지 없음: {variant}")
-                        break  # 이 variant는 없음, 다음 variant로
-                    elif response.status_code == 403:
-                        print(f"[403] 응답 코드: {variant} (attempt {attempt})")
-                        # 지수 백오프 - 더 짧게
-                        if attempt < max_attempts:
-                            backoff = 0.5 * (2 ** (attempt - 1))  # 0.5초, 1초
-                            time.sleep(backoff)
-                        continue
-                    else:
-                        print(f"[{response.status_code}] 응답 코드: {variant}")
-                        break
-                except requests.exceptions.RequestException as e:
-                    print(f"[오류] 학교 페이지 요청 실패 ({variant}, attempt {attempt}): {e}")
-                    if attempt < max_attempts:
-                        time.sleep(0.5 * attempt)  # 1.5초 → 0.5초로 단축
-                    continue
+        wait_seconds 동안 기다려도 다른 워커가 잡고 있으면 None 반환. 워커가 죽으면 OS가 잠금을 푼다.
+        """
+        lock_dir = os.path.join(self.cache_dir, 'locks')
+        if not os.path.exists(lock_dir):
+            os.makedirs(lock_dir, exist_ok=True)
+        safe_name = re.sub(r'[^\w\s-]', '', school_name).strip()
+        f = open(os.path.join(lock_dir, f"school_{safe_name}.lock"), 'w')
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return f
+            except OSError:
+                if time.monotonic() >= deadline:
+                    f.close()
+                    return None
+                time.sleep(0.2)
+    
+    def unlock_school(self, lock):
+        fcntl.flock(lock, fcntl.LOCK_UN)
+        lock.close()
+    
+    def checkpoint_result(self, school_name):
+        """체크포인트에 기록된 지금까지의 결과 (complete=False)"""
+        checkpoint = self.load_checkpoint(school_name)
+        done = checkpoint[1] if checkpoint else {}
+        celebrities = [Celebrity.from_dict(e['celebrity']) for e in done.values() if e.get('celebrity')]
+        return SchoolResult(school_name, celebrities, complete=False)
+    
+    def load_checkpoint(self, school_name):
+        """체크포인트 로드 - (출신 인물 목록, url별 확인 결과) 반환, 없거나 오래됐으면 None"""
+        path = self.get_checkpoint_path(school_name)
+        try:
+            if time.time() - os.path.getmtime(path) > self.cache_ttl:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
         
-        return None
+        try:
+            alumni_list = [Alumnus.from_dict(a) for a in loads(lines[0])['alumni']]
+        except Exception:
+            return None
+        
+        done = {}
+        for line in lines[1:]:
+            try:
+                entry = loads(line)
+            except ValueError:
+                continue  # 기록 중 종료되어 잘린 줄
+            done[entry['url']] = entry
+        return alumni_list, done
+    
+    def remove_checkpoint(self, school_name):
+        try:
+            os.remove(self.get_checkpoint_path(school_name))
+        except OSError:
+            pass
+    
+    def get_school_page(self, school_name):
+        """학교 문서 페이지 가져오기 (여러 표기 시도는 소스가 처리)"""
+        return self.source.fetch_school_page(school_name)
     
     def extract_alumni_section(self, html):
         """출신 인물 섹션 추출 - 리스트 항목에서만 추출"""
+        from bs4 import BeautifulSoup
+        
         soup = BeautifulSoup(html, 'lxml')
         alumni_list = []
         
@@ -178,10 +284,7 @@ class NamuWikiCrawler:
                         # 강력한 필터링 적용
                         if self.is_likely_person_name(name):
                             print(f"[디버깅] 인물 이름으로 판단: {name}")
-                            links_found.append({
-                                'name': name,
-                                'url': href
-                            })
+                            links_found.append(Alumnus(name, href, li_text))
                             found_person_in_li = True
                             break  # 첫 번째 인물 링크만 추출하고 중단
                         else:
@@ -222,7 +325,7 @@ class NamuWikiCrawler:
                         # 리스트 항목에서만 링크 추출
                         links = extract_links_from_list_items(current_list)
                         for link in links:
-                            if not any(a['name'] == link['name'] for a in alumni_list):
+                            if not any(a.name == link.name for a in alumni_list):
                                 alumni_list.append(link)
                         
                         # 다음 형제 리스트 확인
@@ -263,7 +366,7 @@ class NamuWikiCrawler:
                         
                         links = extract_links_from_list_items(list_elem)
                         for link in links:
-                            if not any(a['name'] == link['name'] for a in alumni_list):
+                            if not any(a.name == link.name for a in alumni_list):
                                 alumni_list.append(link)
                     
                     if alumni_list:
@@ -297,7 +400,7 @@ class NamuWikiCrawler:
                         links = extract_links_from_list_items(current)
                         print(f"[디버깅] 리스트에서 추출한 링크 수: {len(links)}")
                         for link in links:
-                            if not any(a['name'] == link['name'] for a in alumni_list):
+                            if not any(a.name == link.name for a in alumni_list):
                                 alumni_list.append(link)
                     # div 내부의 리스트 찾기
                     elif current.name in ['div', 'section']:
@@ -307,7 +410,7 @@ class NamuWikiCrawler:
                             links = extract_links_from_list_items(list_elem)
                             print(f"[디버깅] 리스트에서 추출한 링크 수: {len(links)}")
                             for link in links:
-                                if not any(a['name'] == link['name'] for a in alumni_list):
+                                if not any(a.name == link.name for a in alumni_list):
                                     alumni_list.append(link)
                 
                 if alumni_list:
@@ -341,11 +444,8 @@ class NamuWikiCrawler:
                             href = link.get('href', '')
                             if name and href.startswith('/w/') and not href.startswith('/w/분류:'):
                                 if self.is_likely_person_name(name):
-                                    if not any(a['name'] == name for a in alumni_list):
-                                        alumni_list.append({
-                                            'name': name,
-                                            'url': href
-                                        })
+                                    if not any(a.name == name for a in alumni_list):
+                                        alumni_list.append(Alumnus(name, href, link.parent.get_text().strip()[:100]))
                                         print(f"[디버깅] 링크 발견: {name}")
                 
                 if alumni_list:
@@ -377,11 +477,8 @@ class NamuWikiCrawler:
                         if name and href.startswith('/w/') and not href.startswith('/w/분류:'):
                             # 일반 단어 필터링
                             if self.is_likely_person_name(name):
-                                if not any(a['name'] == name for a in alumni_list):
-                                    alumni_list.append({
-                                        'name': name,
-                                        'url': href
-                                    })
+                                if not any(a.name == name for a in alumni_list):
+                                    alumni_list.append(Alumnus(name, href, parent.get_text().strip()[:100]))
         
         if alumni_list:
             print(f"[출신 인물 추출 성공 (대안)] {len(alumni_list)}명")
@@ -463,6 +560,11 @@ class NamuWikiCrawler:
         
         return True
     
+    def celebrity_score(self, alumnus):
+        """출신 인물 목록 항목의 텍스트로 연예인일 가능성 점수 계산 (높을수록 먼저 확인)"""
+        context = alumnus.context.lower()
+        return sum(1 for keyword in CELEBRITY_KEYWORDS if keyword in context)
+    
     def is_person(self, name, person_html):
         """실제 인물인지 확인"""
         # 특정 키워드 완전 제외
@@ -505,6 +607,8 @@ class NamuWikiCrawler:
             print(f"[인물 아님] 이름이 너무 짧음: {name}")
             return False
         
+        from bs4 import BeautifulSoup
+        
         soup = BeautifulSoup(person_html, 'lxml')
         text = soup.get_text().lower()
         
@@ -533,30 +637,12 @@ class NamuWikiCrawler:
     
     def is_celebrity(self, person_html):
         """연예인 여부 판별 (예술인 포함)"""
+        from bs4 import BeautifulSoup
+        
         soup = BeautifulSoup(person_html, 'lxml')
         text = soup.get_text().lower()
         
-        # 연예인 & 예술인 키워드 확인
-        celebrity_keywords = [
-            # 방송/연예
-            '배우', '가수', '아이돌', '래퍼', '방송인', '개그맨', 
-            '코미디언', 'mc', '엠씨', '아나운서', '모델', '연예인',
-            '싱어', 'singer', 'actor', 'actress', 'idol', 'rapper',
-            '뮤지컬', 'musical', '탤런트', '예능',
-            # 음악 예술
-            '피아니스트', 'pianist', '바이올리니스트', 'violinist',
-            '첼리스트', 'cellist', '성악가', '지휘자', 'conductor',
-            '작곡가', 'composer', '연주자', '클래식',
-            # 무용 예술
-            '무용가', '발레리나', 'ballerina', '댄서', 'dancer',
-            '안무가', 'choreographer',
-            # 미술 예술
-            '화가', 'painter', '조각가', 'sculptor', '예술가', 'artist',
-            # 기타 예술
-            '성우', '뮤지션', 'musician'
-        ]
-        
-        for keyword in celebrity_keywords:
+        for keyword in CELEBRITY_KEYWORDS:
             if keyword in text:
                 return True
         
@@ -564,7 +650,7 @@ class NamuWikiCrawler:
         categories = soup.find_all('div', class_=re.compile('category|분류'))
         for category in categories:
             category_text = category.get_text().lower()
-            for keyword in celebrity_keywords:
+            for keyword in CELEBRITY_KEYWORDS:
                 if keyword in category_text:
                     return True
         
@@ -572,7 +658,7 @@ class NamuWikiCrawler:
         category_links = soup.find_all('a', href=re.compile(r'/w/분류:'))
         for link in category_links:
             link_text = link.get_text().lower()
-            for keyword in celebrity_keywords:
+            for keyword in CELEBRITY_KEYWORDS:
                 if keyword in link_text:
                     return True
         
@@ -581,6 +667,8 @@ class NamuWikiCrawler:
     def get_person_info_from_html(self, html, person_url):
         """HTML에서 인물 정보 추출 (재요청 없이)"""
         try:
+            from bs4 import BeautifulSoup
+            
             soup = BeautifulSoup(html, 'lxml')
             url = f"{self.base_url}{person_url}"
             
@@ -712,103 +800,225 @@ class NamuWikiCrawler:
                 if group:
                     break
             
-            return {
-                'image_url': image_url,
-                'job': job or '연예인',
-                'group': group,
-                'namu_url': url
-            }
+            return PersonInfo(image_url, job or '연예인', group, url)
         except Exception as e:
             print(f"인물 정보 가져오기 실패 ({person_url}): {e}")
             return None
     
     def get_person_info(self, person_url):
         """인물 정보 가져오기 (별도 요청 필요 시)"""
-        url = f"{self.base_url}{person_url}"
-        
         try:
-            time.sleep(1)  # 요청 간 딜레이
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            html = response.text
+            time.sleep(self.source.request_delay)  # 요청 간 딜레이
+            html = self.source.fetch_person_page(person_url)
             return self.get_person_info_from_html(html, person_url)
         except Exception as e:
             print(f"인물 정보 가져오기 실패 ({person_url}): {e}")
             return None
     
-    def crawl_school_celebrities(self, school_name):
-        """학교 출신 연예인 크롤링"""
+    def collect_analysis(self, school_name, person, future, celebrities):
+        """파싱 실행기의 분석 결과를 받아 결과 목록과 체크포인트에 반영"""
+        try:
+            analysis = future.result()
+        except Exception as e:
+            print(f"[인물 페이지 분석 실패] {person.name}: {e}")
+            self.record_progress(school_name, person, 'analyze_failed')
+            return
+        
+        # 먼저 실제 인물인지 확인
+        if not analysis['is_person']:
+            print(f"[건너뜀] 인물이 아님: {person.name}")
+            self.record_progress(school_name, person, 'not_person')
+            return
+        
+        # 출신 인물 섹션에 있는 모든 인물 포함
+        print(f"[출신 인물 추가] {person.name}")
+        # 이미 person_html에서 추출한 정보 사용 (재요청 없음)
+        person_info = analysis['info']
+        celebrity = None
+        if person_info:
+            celebrity = Celebrity(
+                person.name,
+                person_info.job,
+                person_info.group,
+                person_info.image_url,
+                person_info.namu_url
+            )
+            celebrities.append(celebrity)
+        self.record_progress(school_name, person, 'person', celebrity)
+    
+    def start_refresh(self, school_name, cached_data, alumni_list):
+        """증분 갱신 체크포인트 생성 - 새 출신 인물 목록과 캐시를 비교해 다시 확인할 인물만 남김
+
+        목록에서 빠진 인물은 버리고, 기존 인물 중 확인한 지 person_ttl이 지나지 않은 인물은
+        기존 기록을 그대로 옮긴다. 새로 추가된 인물, 오래된 인물, 지난번에 요청/분석이 실패한
+        인물만 크롤링 대상이 된다.
+        """
+        # 인물 문서의 namu_url은 base_url + 문서 경로로 만들어지므로 이를 기준으로 연결
+        celebrities_by_url = {c.namu_url: c for c in cached_data.celebrities}
+        people_by_url = {p.url: p for p in cached_data.people}
+        now = time.time()
+        
+        entries = []
+        for person in alumni_list:
+            status = people_by_url.get(person.url)
+            if status is None or now - status.checked_at > self.person_ttl:
+                continue
+            if status.status not in ('person', 'not_person'):
+                continue  # 일시적인 403/타임아웃일 수 있으므로 다시 확인
+            celebrity = celebrities_by_url.get(f"{self.base_url}{person.url}")
+            entries.append({
+                'url': person.url,
+                'status': status.status,
+                'checked_at': status.checked_at,
+                'celebrity': celebrity.to_dict() if celebrity else None
+            })
+        
+        current_urls = {a.url for a in alumni_list}
+        removed = sum(1 for url in people_by_url if url not in current_urls)
+        print(f"[증분 갱신] 학교명: {school_name}, 유지 {len(entries)}명, "
+              f"다시 확인 {len(alumni_list) - len(entries)}명, 제외 {removed}명")
+        self.start_checkpoint(school_name, alumni_list, entries)
+    
+    def crawl_school_celebrities(self, school_name, budget=None, refresh=False):
+        """학교 출신 연예인 크롤링
+
+        인물 한 명을 확인할 때마다 체크포인트에 기록하므로, 예산이 끝나거나 워커가 죽어도
+        다음 요청(어느 워커든)이 이어서 확인한다. 예산이 끝나면 그때까지의 결과를
+        complete=False로 반환하고, 모두 확인하면 체크포인트를 일반 캐시로 옮긴다.
+        
+        refresh=True이면 캐시가 있어도 학교 문서를 다시 받아 바뀐 인물만 확인한다 (start_refresh).
+        갱신이 끝날 때까지 일반 요청에는 기존 캐시를 그대로 반환한다.
+        캐시가 cache_ttl보다 오래되었으면 일반 요청도 증분 갱신하고, 학교 문서를 받지 못하면
+        만료된 캐시를 그대로 반환한다.
+        
+        같은 학교는 한 번에 한 워커만 크롤링한다 (lock_school). 다른 워커가 크롤링 중이면
+        만료된 캐시나 지금까지의 부분 결과를 반환한다.
+        """
+        budget = budget or self.budget
+        started = time.monotonic()
         print(f"[크롤링 시작] 학교명: {school_name}")
         
         # 캐시 확인
         cached_data = self.load_cache(school_name)
-        if cached_data:
-            print(f"[캐시 사용] 학교명: {school_name}")
-            return cached_data
+        stale = None
+        if cached_data and cached_data.complete and not refresh:
+            if not self.cache_expired(self.cache_mtime(school_name)):
+                print(f"[캐시 사용] 학교명: {school_name}")
+                return cached_data
+            print(f"[캐시 만료] 학교명: {school_name}, 증분 갱신")
+            stale = cached_data
         
-        # 학교 페이지 가져오기
-        html = self.get_school_page(school_name)
-        if not html:
-            print(f"[오류] 학교 문서를 찾을 수 없음: {school_name}")
-            return {'error': f'학교 문서를 찾을 수 없습니다. (검색어: {school_name})'}
-        
-        # 출신 인물 섹션 추출
-        print(f"[출신 인물 섹션 추출 중]")
-        alumni_list = self.extract_alumni_section(html)
-        print(f"[출신 인물 발견] {len(alumni_list)}명")
+        lock = self.lock_school(school_name)
+        if lock is None:
+            print(f"[다른 워커가 크롤링 중] 학교명: {school_name}")
+            # 만료됐거나 갱신 요청이어도 갱신이 끝날 때까지는 기존 캐시를 그대로 반환
+            if cached_data and cached_data.complete:
+                return cached_data
+            return self.checkpoint_result(school_name)
+        try:
+            # 잠금을 기다리는 동안 다른 워커가 크롤링을 끝냈을 수 있음
+            if not refresh:
+                latest = self.load_cache(school_name)
+                if latest and latest.complete and not self.cache_expired(self.cache_mtime(school_name)):
+                    print(f"[캐시 사용] 학교명: {school_name}")
+                    return latest
+            return self.crawl_locked(school_name, cached_data, stale, budget, started)
+        finally:
+            self.unlock_school(lock)
+    
+    def crawl_locked(self, school_name, cached_data, stale, budget, started):
+        """lock_school을 잡은 상태에서 체크포인트를 이어서 (없으면 학교 문서부터) 크롤링"""
+        checkpoint = self.load_checkpoint(school_name)
+        if checkpoint:
+            # 이전 크롤링이 중단된 지점부터 이어서 확인
+            print(f"[체크포인트에서 이어서 크롤링] 학교명: {school_name}")
+        else:
+            # 학교 페이지 가져오기
+            html = self.get_school_page(school_name)
+            if not html:
+                print(f"[오류] 학교 문서를 찾을 수 없음: {school_name}")
+                if stale:
+                    return stale
+                return SchoolResult.failure(f'학교 문서를 찾을 수 없습니다. (검색어: {school_name})')
+            
+            # 출신 인물 섹션 추출
+            print(f"[출신 인물 섹션 추출 중]")
+            alumni_list = self.parse_executor.submit(analyze_school_page, html).result()
+            print(f"[출신 인물 발견] {len(alumni_list)}명")
+            
+            if not alumni_list:
+                return SchoolResult.failure('출신 인물 정보를 찾을 수 없습니다. 문서에 출신 인물 섹션이 없을 수 있습니다.')
+            
+            # 연예인일 가능성이 높은 인물부터 확인 (같은 점수면 문서 순서 유지)
+            alumni_list = sorted(alumni_list, key=self.celebrity_score, reverse=True)
+            if cached_data and cached_data.people:
+                self.start_refresh(school_name, cached_data, alumni_list)
+            else:
+                self.start_checkpoint(school_name, alumni_list)
+            checkpoint = self.load_checkpoint(school_name) or (alumni_list, {})
         
-        if not alumni_list:
-            return {'error': '출신 인물 정보를 찾을 수 없습니다. 문서에 출신 인물 섹션이 없을 수 있습니다.'}
+        alumni_list, done = checkpoint
+        celebrities = [Celebrity.from_dict(e['celebrity']) for e in done.values() if e.get('celebrity')]
+        alumni_list = [a for a in alumni_list if a.url not in done]
+        if done:
+            print(f"[확인 완료 인물] {len(done)}명, 남은 인물 {len(alumni_list)}명")
         
         # 각 인물 확인
-        celebrities = []
-        max_check = 100  # 최대 확인 인원 (충분히 크게)
-        check_count = min(len(alumni_list), max_check)
-        print(f"[출신 인물 정보 수집 시작] 총 {check_count}명 확인 예정")
-        for i, person in enumerate(alumni_list[:max_check]):  # 최대 100명까지 확인
-            person_url = person['url']
+        print(f"[출신 인물 정보 수집 시작] 총 {len(alumni_list)}명 중 최대 {budget.max_people}명 확인 예정")
+        # 페이지 요청은 순서대로 하고, 파싱/판별은 실행기에 넘겨 다음 요청과 겹치게 한다
+        pending = deque()
+        checked = 0
+        fetched_bytes = 0
+        for person in alumni_list:
+            # 예산 확인 (인원 수, 시간 - 요청 간 딜레이 포함, 받은 바이트)
+            elapsed = time.monotonic() - started
+            if checked >= budget.max_people or elapsed + self.source.request_delay >= budget.max_seconds or fetched_bytes >= budget.max_bytes:
+                print(f"[예산 소진] {checked}명 확인, {elapsed:.1f}초, {fetched_bytes}바이트")
+                break
+            checked += 1
+            
+            person_url = person.url
             person_html = None
             
             try:
-                time.sleep(1)  # 요청 간 딜레이 (1.5초 -> 1초로 단축)
-                response = requests.get(
-                    f"{self.base_url}{person_url}",
-                    headers=self.headers,
-                    timeout=10
+                time.sleep(self.source.request_delay)  # 요청 간 딜레이 (덤프 소스는 0)
+                person_html = self.source.fetch_person_page(
+                    person_url,
+                    timeout=max(1, min(10, budget.max_seconds - (time.monotonic() - started)))
                 )
-                response.raise_for_status()
-                person_html = response.text
+                fetched_bytes += len(person_html)
             except Exception as e:
-                print(f"[인물 페이지 요청 실패] {person['name']}: {e}")
+                print(f"[인물 페이지 요청 실패] {person.name}: {e}")
+                self.record_progress(school_name, person, 'fetch_failed')
                 continue
             
-            # 먼저 실제 인물인지 확인
-            if not self.is_person(person['name'], person_html):
-                print(f"[건너뜀] 인물이 아님: {person['name']}")
-                continue
+            pending.append((person, self.parse_executor.submit(
+                analyze_person_page, person.name, person_url, person_html
+            )))
             
-            # 출신 인물 섹션에 있는 모든 인물 포함
-            print(f"[출신 인물 추가] {person['name']}")
-            # 이미 person_html이 있으므로 재요청 없이 정보 추출
-            person_info = self.get_person_info_from_html(person_html, person_url)
-            if person_info:
-                celebrities.append({
-                    'name': person['name'],
-                    'job': person_info.get('job', '인물'),
-                    'group': person_info.get('group'),
-                    'image_url': person_info.get('image_url'),
-                    'namu_url': person_info.get('namu_url', f"{self.base_url}{person_url}")
-                })
-        
-        result = {
-            'school_name': school_name,
-            'celebrities': celebrities,
-            'count': len(celebrities)
-        }
+            # 분석이 끝난 인물은 바로 체크포인트에 기록
+            while pending and pending[0][1].done():
+                self.collect_analysis(school_name, *pending.popleft(), celebrities)
+        
+        while pending:
+            self.collect_analysis(school_name, *pending.popleft(), celebrities)
+        
+        remaining = alumni_list[checked:]
+        result = SchoolResult(school_name, celebrities, complete=not remaining)
         
-        # 캐시 저장 (출신 인물이 있든 없든 저장하여 재검색 시 빠르게 응답)
+        if remaining:
+            print(f"[부분 결과] 학교명: {school_name}, 출신 인물 수: {len(celebrities)}, 남은 인물 수: {len(remaining)}")
+            return result
+        
+        # 체크포인트를 캐시로 옮김 (출신 인물이 있든 없든 저장하여 재검색 시 빠르게 응답)
+        # 결과는 메모리 목록이 아니라 체크포인트 파일 기준으로 다시 만든다
+        checkpoint = self.load_checkpoint(school_name)
+        if checkpoint:
+            done = checkpoint[1]
+            result.celebrities = [Celebrity.from_dict(e['celebrity']) for e in done.values() if e.get('celebrity')]
+            result.people = [PersonStatus.from_dict(e) for e in done.values()]
         self.save_cache(school_name, result)
-        print(f"[캐시 저장 완료] 학교명: {school_name}, 출신 인물 수: {len(celebrities)}")
+        self.remove_checkpoint(school_name)
+        print(f"[캐시 저장 완료] 학교명: {school_name}, 출신 인물 수: {result.count}")
         
         return result
-
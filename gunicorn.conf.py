@@ -0,0 +1,11 @@
+# gunicorn 설정 (gunicorn이 작업 디렉토리의 이 파일을 자동으로 읽음)
+# 명령줄 옵션(--workers, --timeout 등)은 Procfile / nixpacks.toml 에서 지정
+
+# 마스터에서 앱을 한 번만 불러오고 워커는 fork로 공유 (워커 기동/재시작 시간 단축)
+preload_app = True
+
+
+def when_ready(server):
+    """워커를 띄우기 직전에 마스터에서 파싱 스택과 메모리 캐시 준비"""
+    import app
+    app.warm_up()
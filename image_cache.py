@@ -0,0 +1,170 @@
+import hashlib
+import io
+import os
+
+from records import dumps, loads
+
+# 허용하는 썸네일 크기 (임의 크기 요청으로 캐시가 불어나는 것 방지)
+THUMBNAIL_SIZES = (100, 200, 400)
+
+
+class ImageCache:
+    """디스크 기반 이미지 프록시 캐시
+
+    원본 URL의 해시를 키로 메타 정보(<키>.json)를 등록해 두고, 처음 요청될 때 한 번만
+    원본을 받아 본문(<키>)으로 저장한다. ETag는 본문 내용의 해시를 사용한다.
+    본문 파일의 총 크기가 max_bytes를 넘으면 오래 사용되지 않은 것부터 지운다.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None, public_base_url=''):
+        self.cache_dir = os.path.abspath(cache_dir)  # send_file은 앱 기준 상대 경로로 해석하므로 절대 경로 사용
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('IMAGE_CACHE_MAX_BYTES', 500 * 1024 * 1024))
+        self.max_bytes = max_bytes
+        self.public_base_url = public_base_url.rstrip('/')
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Referer': 'https://namu.wiki/'
+        }
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def key_for(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, key, size=None):
+        name = f"{key}_{size}" if size else key
+        return os.path.join(self.cache_dir, name)
+
+    def _write(self, path, data):
+        # 여러 워커가 동시에 써도 깨지지 않도록 임시 파일 후 교체
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _load_meta(self, key):
+        try:
+            with open(self._path(key) + '.json', 'rb') as f:
+                return loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def proxy_url(self, url, base_url):
+        """원본 이미지 URL을 등록하고 base_url 기준 프록시 URL(<base_url>/img/<키>) 반환"""
+        if not url:
+            return url
+        key = self.key_for(url)
+        if self._load_meta(key) is None:
+            self._write(self._path(key) + '.json', dumps({'url': url}))
+        return f"{base_url.rstrip('/')}/img/{key}"
+
+    def get(self, key, size=None):
+        """캐시된 이미지 (경로, Content-Type, ETag) 반환, 등록되지 않은 키면 None"""
+        if not key.isalnum():
+            return None
+        meta = self._load_meta(key)
+        if meta is None:
+            return None
+
+        path = self._path(key)
+        if 'etag' not in meta or not os.path.exists(path):
+            meta = self._fetch(key, meta)
+            if meta is None:
+                return None
+
+        if size in THUMBNAIL_SIZES:
+            thumb = self._thumbnail(key, size)
+            if thumb:
+                return thumb
+
+        try:
+            os.utime(path)  # LRU 정리를 위해 사용 시각 갱신
+        except OSError:
+            return None  # 다른 워커의 정리로 방금 지워짐
+        return path, meta['content_type'], meta['etag']
+
+    def _fetch(self, key, meta):
+        import requests
+        
+        try:
+            response = requests.get(meta['url'], headers=self.headers, timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"[이미지 요청 실패] {meta['url']}: {e}")
+            return None
+
+        data = response.content
+        meta = {
+            'url': meta['url'],
+            'content_type': response.headers.get('Content-Type', 'application/octet-stream'),
+            'etag': hashlib.sha256(data).hexdigest()[:32]
+        }
+        self._write(self._path(key), data)
+        self._write(self._path(key) + '.json', dumps(meta))
+        self.evict(keep=self._path(key))
+        return meta
+
+    def _thumbnail(self, key, size):
+        """고정 크기 썸네일 생성 (Pillow가 없으면 None → 원본 제공)"""
+        try:
+            from PIL import Image
+        except ImportError:
+            return None
+
+        thumb_path = self._path(key, size)
+        thumb_meta_path = thumb_path + '.json'
+        if os.path.exists(thumb_path) and os.path.exists(thumb_meta_path):
+            with open(thumb_meta_path, 'rb') as f:
+                meta = loads(f.read())
+            os.utime(thumb_path)
+            return thumb_path, meta['content_type'], meta['etag']
+
+        try:
+            with Image.open(self._path(key)) as img:
+                fmt = img.format or 'PNG'
+                img.thumbnail((size, size))
+                buf = io.BytesIO()
+                img.save(buf, format=fmt)
+        except Exception as e:
+            print(f"[썸네일 생성 실패] {key}: {e}")
+            return None
+
+        data = buf.getvalue()
+        meta = {
+            'content_type': Image.MIME.get(fmt, 'application/octet-stream'),
+            'etag': hashlib.sha256(data).hexdigest()[:32]
+        }
+        self._write(thumb_path, data)
+        self._write(thumb_meta_path, dumps(meta))
+        self.evict(keep=thumb_path)
+        return thumb_path, meta['content_type'], meta['etag']
+
+    def evict(self, keep=None):
+        """본문 총 크기가 max_bytes 이하가 될 때까지 오래된 이미지 삭제 (원본 URL 등록은 유지)
+
+        keep은 방금 저장해서 곧 응답할 파일 - max_bytes보다 커도 이번에는 지우지 않는다.
+        """
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json') or entry.name.endswith('.tmp'):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,110 @@
+import html
+import re
+
+# 나무마크(덤프의 원본 문법)를 크롤러가 다루는 최소한의 HTML로 변환한다.
+# 제목(h2~h5), 목록(ul/ol/li), 링크(/w/<문서>), 분류 링크, 표를 만들어 주면
+# extract_alumni_section / is_person / get_person_info_from_html을 그대로 쓸 수 있다.
+
+HEADING_PATTERN = re.compile(r'^(={1,6})#?\s*(.*?)\s*#?\1\s*$')
+LIST_PATTERN = re.compile(r'^\s+(\*|1\.|a\.|A\.|i\.|I\.)(#\d+)?\s?(.*)$')
+LINK_PATTERN = re.compile(r'\[\[(.+?)\]\]')
+FOOTNOTE_PATTERN = re.compile(r'\[\*(?:[^\[\]]|\[\[.*?\]\])*\]')
+MACRO_PATTERN = re.compile(r'\[[^\[\]]*\]')
+TABLE_ATTR_PATTERN = re.compile(r'<[^<>]*>')
+BRACE_PATTERN = re.compile(r'\{\{\{(#!\w+[^\s]*|[#+\-][^\s]*)?\s?|\}\}\}')
+FORMAT_PATTERN = re.compile(r"'''|''|__|~~|\^\^|,,")
+
+REDIRECT_PREFIXES = ('#redirect ', '#넘겨주기 ')
+
+
+def redirect_target(text):
+    """넘겨주기 문서이면 대상 문서 제목 반환"""
+    first_line = text.lstrip().split('\n', 1)[0]
+    for prefix in REDIRECT_PREFIXES:
+        if first_line.lower().startswith(prefix):
+            return first_line[len(prefix):].split('#')[0].strip()
+    return None
+
+
+def _render_link(match):
+    target, _, label = match.group(1).partition('|')
+    target = target.strip()
+    label = label.strip() or target
+
+    if target.startswith(('파일:', 'File:')):
+        return ''
+    if target.startswith(('http://', 'https://')):
+        return label
+    if target.startswith('분류:'):
+        return f'<a href="/w/{target}">{target[3:]}</a>'
+
+    target = target.split('#')[0].strip()
+    if not target:
+        return label
+    return f'<a href="/w/{target}">{label}</a>'
+
+
+def _render_inline(text):
+    text = FORMAT_PATTERN.sub('', text)
+    text = html.escape(text, quote=True)
+    text = FOOTNOTE_PATTERN.sub('', text)
+    text = LINK_PATTERN.sub(_render_link, text)
+    text = MACRO_PATTERN.sub(' ', text)
+    text = BRACE_PATTERN.sub('', text)
+    return text.strip()
+
+
+def to_html(text):
+    """나무마크 원문을 HTML 문자열로 변환"""
+    out = ['<html><body>']
+    open_list = None
+    in_table = False
+
+    def close_blocks():
+        nonlocal open_list, in_table
+        if open_list:
+            out.append(f'</{open_list}>')
+            open_list = None
+        if in_table:
+            out.append('</table>')
+            in_table = False
+
+    for line in text.split('\n'):
+        line = line.rstrip('\r')
+        if line.lstrip().startswith('{{{#!'):
+            continue  # {{{#!wiki style=...}}} 같은 블록 시작 줄 (스타일 정보만 있음)
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            close_blocks()
+            level = min(max(len(heading.group(1)), 2), 5)
+            out.append(f'<h{level}>{_render_inline(heading.group(2))}</h{level}>')
+            continue
+
+        item = LIST_PATTERN.match(line)
+        if item:
+            tag = 'ul' if item.group(1) == '*' else 'ol'
+            if in_table or open_list != tag:
+                close_blocks()
+                out.append(f'<{tag}>')
+                open_list = tag
+            out.append(f'<li>{_render_inline(item.group(3))}</li>')
+            continue
+
+        if line.startswith('||'):
+            if not in_table:
+                close_blocks()
+                out.append('<table>')
+                in_table = True
+            cells = TABLE_ATTR_PATTERN.sub('', line).strip('|').split('||')
+            out.append('<tr>' + ''.join(f'<td>{_render_inline(cell)}</td>' for cell in cells) + '</tr>')
+            continue
+
+        close_blocks()
+        content = _render_inline(line)
+        if content:
+            out.append(f'<p>{content}</p>')
+
+    close_blocks()
+    out.append('</body></html>')
+    return '\n'.join(out)
@@ -0,0 +1,95 @@
+import os
+from concurrent.futures import Future
+
+# 프로세스 풀 워커마다 하나씩 만들어 두는 크롤러 (파싱 메서드만 사용)
+_worker_crawler = None
+
+
+def _init_worker(cache_dir):
+    """프로세스 풀 워커 초기화"""
+    global _worker_crawler
+    from crawler import NamuWikiCrawler
+    _worker_crawler = NamuWikiCrawler(cache_dir=cache_dir, parse_executor=InlineParseExecutor())
+
+
+def _get_crawler():
+    global _worker_crawler
+    if _worker_crawler is None:
+        _init_worker("cache")
+    return _worker_crawler
+
+
+def _decode(html_bytes):
+    if isinstance(html_bytes, bytes):
+        return html_bytes.decode('utf-8', errors='replace')
+    return html_bytes
+
+
+def analyze_school_page(html_bytes, crawler=None):
+    """학교 문서 분석 - 출신 인물 목록(Alumnus 리스트) 반환 (crawler가 없으면 워커의 크롤러 사용)"""
+    return (crawler or _get_crawler()).extract_alumni_section(_decode(html_bytes))
+
+
+def analyze_person_page(name, person_url, html_bytes, crawler=None):
+    """인물 문서 분석 - 파싱 트리 대신 작은 결과 dict만 반환 (crawler가 없으면 워커의 크롤러 사용)"""
+    crawler = crawler or _get_crawler()
+    html = _decode(html_bytes)
+    if not crawler.is_person(name, html):
+        return {'is_person': False, 'info': None}
+    return {'is_person': True, 'info': crawler.get_person_info_from_html(html, person_url)}
+
+
+class InlineParseExecutor:
+    """현재 프로세스에서 바로 파싱 (기본값) - 호출한 크롤러를 그대로 넘겨 따로 만들지 않는다"""
+
+    def __init__(self, crawler=None):
+        self.crawler = crawler
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args, crawler=self.crawler))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self):
+        pass
+
+
+class ProcessParseExecutor:
+    """프로세스 풀에서 파싱 (GIL 우회, 코어 수만큼 확장)"""
+
+    def __init__(self, max_workers=None, cache_dir="cache"):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self._pool = None
+
+    def submit(self, fn, *args):
+        # gunicorn 워커가 fork된 뒤에 풀을 만들도록 첫 사용 시 생성
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.cache_dir,)
+            )
+        return self._pool.submit(fn, *args)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def make_parse_executor(crawler):
+    """환경 변수로 파싱 실행기 선택
+
+    PARSE_EXECUTOR=process 이면 프로세스 풀 사용 (PARSE_WORKERS로 워커 수 지정, 워커마다 크롤러를 만듦),
+    그 외에는 현재 프로세스에서 crawler로 파싱한다.
+    """
+    mode = os.environ.get('PARSE_EXECUTOR', 'inline').lower()
+    if mode == 'process':
+        workers = os.environ.get('PARSE_WORKERS')
+        return ProcessParseExecutor(max_workers=int(workers) if workers else None, cache_dir=crawler.cache_dir)
+    return InlineParseExecutor(crawler)
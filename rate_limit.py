@@ -0,0 +1,123 @@
+import fcntl
+import math
+import os
+import random
+import sqlite3
+import time
+
+
+class TokenBucketLimiter:
+    """클라이언트별 토큰 버킷 (SQLite 파일에 저장해 gunicorn 워커끼리 공유)
+
+    버킷은 capacity개까지 토큰을 담고, 1분에 refill_per_minute개씩 채워진다.
+    요청마다 비용만큼 토큰을 꺼내고, 모자라면 다시 시도할 수 있을 때까지의 초를 돌려준다.
+    """
+
+    def __init__(self, db_path, capacity=None, refill_per_minute=None):
+        if capacity is None:
+            capacity = float(os.environ.get('RATE_LIMIT_BURST', 30))
+        if refill_per_minute is None:
+            refill_per_minute = float(os.environ.get('RATE_LIMIT_PER_MINUTE', 10))
+        if capacity <= 0 or refill_per_minute <= 0:
+            raise ValueError('RATE_LIMIT_BURST와 RATE_LIMIT_PER_MINUTE는 0보다 커야 합니다.')
+        self.db_path = db_path
+        self.capacity = capacity
+        self.refill_per_second = refill_per_minute / 60
+        self._initialized = False
+
+    def _connect(self):
+        # 워커(fork)마다 연결을 새로 만든다 - 연결을 프로세스 사이에 공유하면 안 됨
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS buckets ('
+                'client TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._initialized = True
+        return conn
+
+    def take(self, client, cost):
+        """토큰 cost개 사용 - (허용 여부, 다시 시도까지 남은 초) 반환"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE client = ?', (client,)).fetchone()
+            tokens = self.capacity
+            if row:
+                tokens = min(self.capacity, row[0] + (now - row[1]) * self.refill_per_second)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                'INSERT OR REPLACE INTO buckets (client, tokens, updated) VALUES (?, ?, ?)',
+                (client, tokens, now)
+            )
+
+            # 가끔 가득 찬 버킷을 정리 (다시 채워질 시간이 지난 클라이언트)
+            if random.random() < 0.01:
+                conn.execute(
+                    'DELETE FROM buckets WHERE updated < ?',
+                    (now - self.capacity / self.refill_per_second,)
+                )
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            # 저장소 문제로 서비스 전체를 막지는 않는다
+            print(f"[요청 제한 저장소 오류] {e}")
+            return True, 0
+        finally:
+            conn.close()
+
+        if allowed:
+            return True, 0
+        return False, math.ceil((cost - tokens) / self.refill_per_second)
+
+    def refund(self, client, cost):
+        """take로 쓴 토큰 되돌리기 (요청을 처리하지 못한 경우, capacity를 넘지 않음)"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                'UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE client = ?',
+                (self.capacity, cost, client)
+            )
+        except sqlite3.Error as e:
+            print(f"[요청 제한 저장소 오류] {e}")
+        finally:
+            conn.close()
+
+
+class CrawlSlots:
+    """동시에 실행할 수 있는 새 크롤링 수 제한 (모든 워커 공통)
+
+    슬롯마다 잠금 파일을 두고 fcntl.flock으로 잡는다. 워커가 죽으면 OS가 잠금을 풀어 주므로
+    슬롯이 새지 않는다.
+    """
+
+    def __init__(self, lock_dir, max_concurrent=None):
+        if max_concurrent is None:
+            max_concurrent = int(os.environ.get('MAX_COLD_CRAWLS', 1))
+        self.lock_dir = lock_dir
+        self.max_concurrent = max_concurrent
+        if not os.path.exists(lock_dir):
+            os.makedirs(lock_dir)
+
+    def acquire(self, wait_seconds=0):
+        """빈 슬롯을 잡아 파일 객체 반환 (wait_seconds 동안 기다려도 없으면 None)"""
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            for i in range(self.max_concurrent):
+                f = open(os.path.join(self.lock_dir, f"crawl_slot_{i}.lock"), 'w')
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return f
+                except OSError:
+                    f.close()
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0.2)
+
+    def release(self, slot):
+        fcntl.flock(slot, fcntl.LOCK_UN)
+        slot.close()
@@ -0,0 +1,185 @@
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+# slots=True는 Python 3.10부터 지원
+_record = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+def dumps(data):
+    """dict/list를 압축된 JSON 바이트로 직렬화"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(raw):
+    """JSON 바이트/문자열 역직렬화"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@_record
+class Alumnus:
+    """학교 문서의 출신 인물 목록 항목 (context: 목록 항목의 텍스트)"""
+    name: str
+    url: str
+    context: str = ''
+
+    def to_dict(self):
+        return {'name': self.name, 'url': self.url, 'context': self.context}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['url'], data.get('context', ''))
+
+
+@_record
+class PersonInfo:
+    """인물 문서에서 추출한 정보"""
+    image_url: Optional[str]
+    job: str
+    group: Optional[str]
+    namu_url: str
+
+    def to_dict(self):
+        return {
+            'image_url': self.image_url,
+            'job': self.job,
+            'group': self.group,
+            'namu_url': self.namu_url
+        }
+
+
+@_record
+class Celebrity:
+    """검색 결과의 출신 인물 한 명"""
+    name: str
+    job: str
+    group: Optional[str]
+    image_url: Optional[str]
+    namu_url: str
+
+    def to_dict(self, image_url_for=None):
+        return {
+            'name': self.name,
+            'job': self.job,
+            'group': self.group,
+            'image_url': image_url_for(self.image_url) if image_url_for else self.image_url,
+            'namu_url': self.namu_url
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['name'],
+            data.get('job', '인물'),
+            data.get('group'),
+            data.get('image_url'),
+            data['namu_url']
+        )
+
+
+@_record
+class PersonStatus:
+    """캐시에 함께 저장하는 출신 인물별 확인 기록 (증분 갱신용)
+
+    status: 'fetch_failed' | 'analyze_failed' | 'not_person' | 'person'
+    """
+    url: str
+    status: str
+    checked_at: float
+
+    def to_dict(self):
+        return {'url': self.url, 'status': self.status, 'checked_at': self.checked_at}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['url'], data['status'], data.get('checked_at', 0))
+
+
+@_record
+class CrawlBudget:
+    """요청 하나에서 쓸 수 있는 크롤링 예산 (인원 수, 시간, 받은 바이트)"""
+    max_people: int = 100
+    max_seconds: float = 90.0
+    max_bytes: int = 50 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            int(os.environ.get('CRAWL_MAX_PEOPLE', 100)),
+            float(os.environ.get('CRAWL_MAX_SECONDS', 90)),
+            int(os.environ.get('CRAWL_MAX_BYTES', 50 * 1024 * 1024))
+        )
+
+    def limited(self, max_people=None, max_seconds=None, max_bytes=None):
+        """요청에서 지정한 값으로 줄인 예산 반환 (서버 설정보다 늘릴 수는 없음)"""
+        return CrawlBudget(
+            min(self.max_people, max_people) if max_people else self.max_people,
+            min(self.max_seconds, max_seconds) if max_seconds else self.max_seconds,
+            min(self.max_bytes, max_bytes) if max_bytes else self.max_bytes
+        )
+
+
+@_record
+class SchoolResult:
+    """학교 검색 결과 (error가 있으면 실패 응답, 예산이 끝나 일부만 확인했으면 complete가 False)
+
+    people은 캐시 파일에만 저장되고 API 응답에는 포함되지 않는다.
+    image_url은 나무위키 원본 주소로 저장하고, 응답할 때 image_url_for로 프록시 주소로 바꾼다.
+    """
+    school_name: Optional[str] = None
+    celebrities: List[Celebrity] = field(default_factory=list)
+    error: Optional[str] = None
+    complete: bool = True
+    people: List[PersonStatus] = field(default_factory=list)
+
+    @classmethod
+    def failure(cls, message):
+        return cls(error=message)
+
+    @property
+    def count(self):
+        return len(self.celebrities)
+
+    def to_dict(self, image_url_for=None):
+        if self.error:
+            return {'error': self.error}
+        return {
+            'school_name': self.school_name,
+            'celebrities': [c.to_dict(image_url_for) for c in self.celebrities],
+            'count': self.count,
+            'complete': self.complete
+        }
+
+    def to_cache_dict(self):
+        data = self.to_dict()
+        if self.people:
+            data['people'] = [p.to_dict() for p in self.people]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        if 'error' in data:
+            return cls.failure(data['error'])
+        return cls(
+            data['school_name'],
+            [Celebrity.from_dict(c) for c in data.get('celebrities', [])],
+            complete=data.get('complete', True),
+            people=[PersonStatus.from_dict(p) for p in data.get('people', [])]
+        )
+
+    def to_json(self, image_url_for=None):
+        return dumps(self.to_dict(image_url_for))
+
+    def to_cache_json(self):
+        return dumps(self.to_cache_dict())
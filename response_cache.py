@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 사용
+    brotli = None
+
+# 이 크기보다 작은 응답은 압축하지 않음
+MIN_COMPRESS_BYTES = 1024
+
+# 인코딩마다 본문 바이트가 다르므로 강한 ETag도 따로 붙임 (Content-Encoding → 접미사)
+ETAG_SUFFIXES = {None: '', 'gzip': '-gz', 'br': '-br'}
+
+
+class CachedResponse:
+    """직렬화/압축이 끝난 검색 결과 응답"""
+    __slots__ = ('mtime', 'body', 'etag', 'gzip', 'br')
+
+    def __init__(self, mtime, body):
+        self.mtime = mtime
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.gzip = None
+        self.br = None
+        if len(body) >= MIN_COMPRESS_BYTES:
+            self.gzip = gzip.compress(body, compresslevel=6)
+            if brotli is not None:
+                self.br = brotli.compress(body)
+
+    def etag_for(self, encoding):
+        """Content-Encoding별 ETag 값 (따옴표 제외)"""
+        return self.etag + ETAG_SUFFIXES[encoding]
+
+    def etags(self):
+        """이 응답의 모든 인코딩 ETag - If-None-Match는 어느 것이든 일치로 봄"""
+        return [self.etag_for(encoding) for encoding in ETAG_SUFFIXES]
+
+    def encoded(self, accept_encodings):
+        """클라이언트가 받을 수 있는 가장 작은 (본문, Content-Encoding) 반환"""
+        if self.br is not None and accept_encodings['br']:
+            return self.br, 'br'
+        if self.gzip is not None and accept_encodings['gzip']:
+            return self.gzip, 'gzip'
+        return self.body, None
+
+
+class ResponseCache:
+    """워커 메모리에 두는 검색 응답 캐시 (LRU)
+
+    캐시 파일의 수정 시각(mtime)을 함께 저장해 두고, 파일이 바뀌었거나 없어졌으면 무효로 본다.
+    """
+
+    def __init__(self, max_entries=None):
+        if max_entries is None:
+            max_entries = int(os.environ.get('HOT_CACHE_SIZE', 128))
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, mtime):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.mtime != mtime:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, mtime, body):
+        entry = CachedResponse(mtime, body)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
@@ -0,0 +1,273 @@
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import urllib.parse
+import zlib
+
+import namumark
+
+# 학교 문서 / 인물 문서로 볼 수 있는 덤프 문서만 저장 (나머지는 건너뜀)
+ALUMNI_HEADING_PATTERN = re.compile(r'^=+#?\s*[^=\n]*(출신 인물|출신|동문|졸업생)', re.MULTILINE)
+PERSON_PATTERN = re.compile(r'출생|생년|본명')
+
+# 문서 하나가 이보다 길면 깨진 것으로 보고 다음 문서로 건너뜀 (버퍼가 끝없이 커지는 것 방지)
+MAX_DOC_CHARS = 64 * 1024 * 1024
+# 다음 문서 시작 위치 - 문자열 안의 "는 항상 이스케이프되므로 {" 는 문서(객체) 시작에만 나온다
+DOC_START_PATTERN = re.compile(r'[\[,\n]\s*(?=\{")')
+
+
+def school_name_variations(school_name):
+    """학교 문서 제목 후보 (서울예고 ↔ 서울예술고등학교 등)"""
+    variations = [
+        school_name,  # 원본
+        school_name.replace(' ', ''),  # 띄어쓰기 제거
+        school_name.replace(' ', '·'),  # 나무위키 중간점
+    ]
+
+    # "고등학교" ↔ "고" 변환 추가
+    if '고등학교' in school_name:
+        # "서울예술고등학교" → "서울예술고"
+        short_name = school_name.replace('고등학교', '고')
+        variations.append(short_name)
+        variations.append(short_name.replace(' ', ''))
+    elif school_name.endswith('고'):
+        # "서울예술고" → "서울예술고등학교"
+        full_name = school_name[:-1] + '고등학교'
+        variations.append(full_name)
+        variations.append(full_name.replace(' ', ''))
+    return variations
+
+
+class LiveSource:
+    """나무위키 사이트에서 HTML 문서를 직접 받아오는 소스 (기본값)"""
+
+    # 인물 문서 요청 간 딜레이 (초)
+    request_delay = 1
+
+    def __init__(self, base_url, headers, user_agents, proxy_url=None):
+        self.base_url = base_url
+        self.headers = headers
+        self.user_agents = user_agents
+        self.proxy_url = proxy_url
+
+    def fetch_school_page(self, school_name):
+        """학교 문서 HTML(bytes) 반환, 없으면 None"""
+        import requests
+
+        # 세션 생성
+        session = requests.Session()
+        session.headers.update(self.headers)
+        if self.proxy_url:
+            session.proxies.update({'http': self.proxy_url, 'https': self.proxy_url})
+
+        # 각 variant에 대해 여러번 시도 (User-Agent 회전, 지수 백오프)
+        for i, variant in enumerate(school_name_variations(school_name)):
+            encoded_name = urllib.parse.quote(variant)
+            url = f"{self.base_url}/w/{encoded_name}"
+
+            # variant 간 기본 대기
+            if i > 0:
+                time.sleep(0.5)  # 1.5초 → 0.5초로 단축
+
+            max_attempts = 2  # 3회 → 2회로 감소
+            for attempt in range(1, max_attempts + 1):
+                # 시도할 때마다 User-Agent를 바꿔 본다
+                ua = self.user_agents[(attempt - 1) % len(self.user_agents)]
+                session.headers.update({'User-Agent': ua, 'Referer': self.headers.get('Referer')})
+
+                try:
+                    print(f"[시도] URL: {url} (variant={variant}, attempt={attempt})")
+                    response = session.get(url, timeout=10, allow_redirects=True)
+
+                    if response.status_code == 200:
+                        print(f"[성공] 학교 페이지 로드: {variant}")
+                        return response.content
+                    elif response.status_code == 404:
+                        print(f"[404] 페이지 없음: {variant}")
+                        break  # 이 variant는 없음, 다음 variant로
+                    elif response.status_code == 403:
+                        print(f"[403] 응답 코드: {variant} (attempt {attempt})")
+                        # 지수 백오프 - 더 짧게
+                        if attempt < max_attempts:
+                            backoff = 0.5 * (2 ** (attempt - 1))  # 0.5초, 1초
+                            time.sleep(backoff)
+                        continue
+                    else:
+                        print(f"[{response.status_code}] 응답 코드: {variant}")
+                        break
+                except requests.exceptions.RequestException as e:
+                    print(f"[오류] 학교 페이지 요청 실패 ({variant}, attempt {attempt}): {e}")
+                    if attempt < max_attempts:
+                        time.sleep(0.5 * attempt)  # 1.5초 → 0.5초로 단축
+                    continue
+
+        return None
+
+    def fetch_person_page(self, person_url, timeout=10):
+        """인물 문서 HTML(bytes) 반환, 실패하면 예외"""
+        import requests
+
+        response = requests.get(
+            f"{self.base_url}{person_url}",
+            headers=self.headers,
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.content
+
+
+class DumpSource:
+    """나무위키 덤프로 만든 로컬 저장소(SQLite)에서 문서를 읽는 소스
+
+    문서는 나무마크 원문으로 저장되어 있고, 읽을 때 namumark.to_html로 변환해
+    라이브 소스와 같은 HTML 추출 로직을 그대로 쓴다. 네트워크 요청이 없으므로 딜레이도 없다.
+    """
+
+    request_delay = 0
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._conn_pid = None
+
+    def _connection(self):
+        # gunicorn --preload로 fork된 워커는 자기 연결을 새로 연다
+        if self._conn is None or self._conn_pid != os.getpid():
+            self._conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def get_markup(self, title, max_redirects=3):
+        """문서 제목으로 나무마크 원문 반환 (넘겨주기 문서는 대상 문서로 이동), 없으면 None"""
+        for _ in range(max_redirects + 1):
+            row = self._connection().execute('SELECT text FROM pages WHERE title = ?', (title,)).fetchone()
+            if row is None:
+                return None
+            text = zlib.decompress(row[0]).decode('utf-8')
+            target = namumark.redirect_target(text)
+            if not target:
+                return text
+            title = target
+        return None
+
+    def fetch_school_page(self, school_name):
+        for variant in school_name_variations(school_name):
+            text = self.get_markup(variant)
+            if text is not None:
+                print(f"[성공] 학교 문서 로드 (덤프): {variant}")
+                return namumark.to_html(text).encode('utf-8')
+        return None
+
+    def fetch_person_page(self, person_url, timeout=None):
+        title = urllib.parse.unquote(person_url[len('/w/'):]).split('#')[0]
+        text = self.get_markup(title)
+        if text is None:
+            raise LookupError(f"덤프에 없는 문서: {title}")
+        return namumark.to_html(text).encode('utf-8')
+
+
+def iter_dump(dump_path, chunk_size=1 << 20, max_doc_chars=MAX_DOC_CHARS):
+    """나무위키 JSON 덤프를 문서 단위로 스트리밍 파싱 (파일 전체를 메모리에 올리지 않음)
+
+    [ {...}, {...} ] 형식의 배열과 한 줄에 문서 하나씩인 JSON Lines 형식을 모두 지원한다.
+    깨진 문서는 경고를 남기고 다음 문서 시작 위치까지 건너뛴다.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    skipping = False
+    with open(dump_path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buf = buf[pos:] + chunk
+            pos = 0
+            while True:
+                if skipping:
+                    match = DOC_START_PATTERN.search(buf, pos)
+                    if match is None:
+                        pos = max(pos, len(buf) - 16)  # 구분자가 다음 조각에 걸쳐 있을 수 있음
+                        break
+                    pos = match.end()
+                    skipping = False
+                # 배열 괄호, 쉼표, 공백 건너뛰기
+                while pos < len(buf) and buf[pos] in '[],\r\n\t ':
+                    pos += 1
+                if pos >= len(buf):
+                    break
+                try:
+                    doc, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if chunk and len(buf) - pos <= max_doc_chars:
+                        break  # 문서가 다음 조각까지 이어짐
+                    print(f"[덤프 경고] 깨진 문서 건너뜀: {e.msg}")
+                    pos += 1
+                    skipping = True
+                    continue
+                pos = end
+                yield doc
+            if not chunk:
+                return
+
+
+def ingest_dump(dump_path, db_path):
+    """덤프에서 학교/인물/넘겨주기 문서만 골라 SQLite 저장소 생성 (완성 후 교체)"""
+    db_dir = os.path.dirname(db_path)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir)
+    tmp_path = f"{db_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('CREATE TABLE pages (title TEXT PRIMARY KEY, text BLOB NOT NULL)')
+
+    started = time.monotonic()
+    scanned = 0
+    stored = 0
+    batch = []
+    for doc in iter_dump(dump_path):
+        scanned += 1
+        if str(doc.get('namespace', '0')) not in ('0', ''):
+            continue
+        title = doc.get('title')
+        text = doc.get('text') or ''
+        if not title:
+            continue
+        if not (namumark.redirect_target(text) or ALUMNI_HEADING_PATTERN.search(text) or PERSON_PATTERN.search(text)):
+            continue
+        batch.append((title, zlib.compress(text.encode('utf-8'))))
+        if len(batch) >= 1000:
+            conn.executemany('INSERT OR REPLACE INTO pages VALUES (?, ?)', batch)
+            stored += len(batch)
+            batch = []
+            print(f"[덤프 저장 중] {scanned}개 확인, {stored}개 저장")
+    conn.executemany('INSERT OR REPLACE INTO pages VALUES (?, ?)', batch)
+    stored += len(batch)
+    conn.commit()
+    conn.close()
+
+    os.replace(tmp_path, db_path)
+    print(f"[덤프 저장 완료] {scanned}개 중 {stored}개 저장, {time.monotonic() - started:.1f}초 → {db_path}")
+
+
+def make_source(crawler):
+    """환경 변수로 문서 소스 선택
+
+    NAMU_SOURCE=dump 이면 NAMU_DUMP_DB(기본 cache/namuwiki.sqlite3) 저장소를 사용하고,
+    그 외에는 나무위키 사이트에서 직접 받아온다.
+    """
+    if os.environ.get('NAMU_SOURCE', 'live').lower() == 'dump':
+        return DumpSource(os.environ.get('NAMU_DUMP_DB', os.path.join(crawler.cache_dir, 'namuwiki.sqlite3')))
+    return LiveSource(crawler.base_url, crawler.headers, crawler.user_agents, crawler.proxy_url)
+
+
+if __name__ == '__main__':
+    # 사용법: python sources.py <덤프 JSON 경로> [저장소 경로]
+    if len(sys.argv) < 2:
+        print("사용법: python sources.py <덤프 JSON 경로> [저장소 경로]")
+        sys.exit(1)
+    ingest_dump(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else os.path.join('cache', 'namuwiki.sqlite3'))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 최상위 모듈(crawler, sources 등)을 바로 불러올 수 있도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
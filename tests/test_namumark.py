@@ -0,0 +1,35 @@
+import namumark
+
+
+def test_redirect_target():
+    assert namumark.redirect_target('#redirect 서울예술고등학교') == '서울예술고등학교'
+    assert namumark.redirect_target('#넘겨주기 서울예술고등학교#출신 인물') == '서울예술고등학교'
+    assert namumark.redirect_target('#REDIRECT 서울예고\n') == '서울예고'
+    assert namumark.redirect_target('== 개요 ==\n#redirect 아님') is None
+
+
+def test_headings_and_lists():
+    html = namumark.to_html('== 출신 인물 ==\n=== 연예계 ===\n * [[김고은]] - 배우\n * [[홍길동|길동]]\n 1. 첫째')
+    assert '<h2>출신 인물</h2>' in html
+    assert '<h3>연예계</h3>' in html
+    assert '<ul>\n<li><a href="/w/김고은">김고은</a> - 배우</li>\n<li><a href="/w/홍길동">길동</a></li>\n</ul>' in html
+    assert '<ol>\n<li>첫째</li>\n</ol>' in html
+
+
+def test_links():
+    html = namumark.to_html("[[파일:사진.jpg]] [[https://example.com|바깥]] [[분류:대한민국의 배우]] [[문서#개요|개요]]")
+    assert '파일:' not in html
+    assert '바깥' in html and 'example.com' not in html
+    assert '<a href="/w/분류:대한민국의 배우">대한민국의 배우</a>' in html
+    assert '<a href="/w/문서">개요</a>' in html
+
+
+def test_table():
+    html = namumark.to_html("||<tablewidth=100%> '''김고은''' ||\n|| 출생 || 1991년 ||\n본문")
+    assert '<table>\n<tr><td>김고은</td></tr>\n<tr><td>출생</td><td>1991년</td></tr>\n</table>' in html
+    assert '<p>본문</p>' in html
+
+
+def test_strips_markup_and_escapes():
+    html = namumark.to_html("'''굵게''' 각주[* 설명 [[링크]]] [include(틀:인물)] {{{#red 빨강}}} <b>")
+    assert '<p>굵게 각주   빨강 &lt;b&gt;</p>' in html
@@ -0,0 +1,62 @@
+import pytest
+
+import rate_limit
+from rate_limit import TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def make_limiter(tmp_path, monkeypatch, capacity=3, refill_per_minute=60):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, 'time', clock.time)
+    return TokenBucketLimiter(str(tmp_path / 'ratelimit.sqlite3'), capacity, refill_per_minute), clock
+
+
+def test_take_until_empty(tmp_path, monkeypatch):
+    limiter, _ = make_limiter(tmp_path, monkeypatch)
+    assert [limiter.take('ip:1', 1) for _ in range(3)] == [(True, 0)] * 3
+    assert limiter.take('ip:1', 1) == (False, 1)
+    # 다른 클라이언트는 따로 센다
+    assert limiter.take('ip:2', 1) == (True, 0)
+
+
+def test_refill_over_time(tmp_path, monkeypatch):
+    limiter, clock = make_limiter(tmp_path, monkeypatch)
+    assert limiter.take('ip:1', 3) == (True, 0)
+    assert limiter.take('ip:1', 2) == (False, 2)
+    clock.now += 2
+    assert limiter.take('ip:1', 2) == (True, 0)
+    # 오래 지나도 capacity 이상은 쌓이지 않는다
+    clock.now += 3600
+    assert limiter.take('ip:1', 4) == (False, 1)
+
+
+def test_shared_between_instances(tmp_path, monkeypatch):
+    # 워커마다 따로 만든 limiter도 같은 SQLite 파일의 버킷을 쓴다
+    first, _ = make_limiter(tmp_path, monkeypatch)
+    second = TokenBucketLimiter(first.db_path, 3, 60)
+    assert first.take('ip:1', 3) == (True, 0)
+    assert second.take('ip:1', 1) == (False, 1)
+
+
+def test_refund(tmp_path, monkeypatch):
+    limiter, _ = make_limiter(tmp_path, monkeypatch)
+    assert limiter.take('ip:1', 3) == (True, 0)
+    limiter.refund('ip:1', 2)
+    assert limiter.take('ip:1', 2) == (True, 0)
+    # 되돌려도 capacity를 넘지 않는다
+    limiter.refund('ip:1', 10)
+    assert limiter.take('ip:1', 4) == (False, 1)
+
+
+def test_rejects_non_positive_settings(tmp_path):
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(str(tmp_path / 'ratelimit.sqlite3'), 30, 0)
+    with pytest.raises(ValueError):
+        TokenBucketLimiter(str(tmp_path / 'ratelimit.sqlite3'), 0, 10)
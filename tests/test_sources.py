@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+import sources
+
+DOCS = [
+    {'namespace': '0', 'title': '서울예술고등학교', 'text': '== 출신 인물 ==\n * [[김고은]]'},
+    {'namespace': '0', 'title': '서울예고', 'text': '#redirect 서울예술고등학교'},
+    {'namespace': '0', 'title': '김고은', 'text': '|| 출생 || 1991년 ||\n{"괄호", "쉼표"}'},
+]
+
+
+def write(tmp_path, content):
+    path = tmp_path / 'dump.json'
+    path.write_text(content, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 20])
+def test_iter_dump_array(tmp_path, chunk_size):
+    path = write(tmp_path, json.dumps(DOCS, ensure_ascii=False))
+    assert list(sources.iter_dump(path, chunk_size=chunk_size)) == DOCS
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 20])
+def test_iter_dump_json_lines(tmp_path, chunk_size):
+    path = write(tmp_path, '\n'.join(json.dumps(d, ensure_ascii=False) for d in DOCS) + '\n')
+    assert list(sources.iter_dump(path, chunk_size=chunk_size)) == DOCS
+
+
+def test_iter_dump_skips_malformed_document(tmp_path):
+    broken = '{"namespace": "0", "title": "깨진 문서", "text": "끝나지 않음}'
+    content = '[' + ','.join([json.dumps(DOCS[0], ensure_ascii=False), broken] +
+                             [json.dumps(d, ensure_ascii=False) for d in DOCS[1:]]) + ']'
+    path = write(tmp_path, content)
+    # 깨진 문서 때문에 파일 끝까지 버퍼에 쌓지 않고 max_doc_chars를 넘으면 건너뛴다
+    assert list(sources.iter_dump(path, chunk_size=16, max_doc_chars=200)) == DOCS
+
+
+def test_iter_dump_skips_malformed_document_at_end(tmp_path):
+    path = write(tmp_path, json.dumps(DOCS[0], ensure_ascii=False) + '\n{"title": ')
+    assert list(sources.iter_dump(path)) == DOCS[:1]
+
+
+def test_ingest_and_dump_source(tmp_path):
+    docs = DOCS + [{'namespace': '0', 'title': '사과', 'text': '과일'}]
+    dump_path = write(tmp_path, json.dumps(docs, ensure_ascii=False))
+    db_path = str(tmp_path / 'store' / 'namuwiki.sqlite3')
+    sources.ingest_dump(dump_path, db_path)
+
+    source = sources.DumpSource(db_path)
+    assert source.get_markup('사과') is None  # 학교/인물 문서가 아니면 저장하지 않음
+    assert b'<h2>' in source.fetch_school_page('서울예고')  # 넘겨주기 문서를 따라감
+    assert '출생' in source.fetch_person_page('/w/%EA%B9%80%EA%B3%A0%EC%9D%80').decode('utf-8')
+    with pytest.raises(LookupError):
+        source.fetch_person_page('/w/없는사람')